@@ -175,7 +175,7 @@ class AttendanceWindow(tk.Toplevel):
         """
         month = self.date.strftime('%B')
         year = self.date.year
-        filename = os.path.join(os.path.dirname(__file__), f'{month}_{year}_EndMonth.csv')
+        filename = self.db_manager.get_end_month_filename(month, year)
         if os.path.exists(filename):
             messagebox.showinfo("Error", "The month has been finalized. You cannot modify the attendance.", parent=self)
             return True
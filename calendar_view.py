@@ -71,7 +71,7 @@ class CalendarView(tk.Toplevel):
             date = self.cal.selection_get()
             month = date.strftime('%B')
             year = date.year
-            filename = os.path.join(os.path.dirname(__file__), f'{month}_{year}_EndMonth.csv')
+            filename = self.db_manager.get_end_month_filename(month, year)
             if os.path.exists(filename):
                 messagebox.showinfo("Error", "This month has already been finalized.", parent=self)
                 return
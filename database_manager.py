@@ -72,3 +72,9 @@ class DatabaseManager:
             writer = csv.DictWriter(file, fieldnames=fieldnames)
             writer.writeheader()
             writer.writerows(data)
+
+    def get_end_month_filename(self, month, year):
+        """
+        Get the path of the file which marks a month as finalized. It is kept alongside the database files.
+        """
+        return os.path.join(os.path.dirname(self.database_filename), f'{month}_{year}_EndMonth.csv')
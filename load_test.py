@@ -0,0 +1,869 @@
+import argparse
+import csv
+import datetime
+import glob
+import math
+import os
+import random
+import re
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+import attendance_window
+import calendar_view
+import daycare_database_app
+from attendance_window import AttendanceWindow
+from calendar_view import CalendarView
+from daycare_database_app import DaycareDatabaseApp
+from database_manager import DatabaseManager
+
+"""
+load_test.py
+
+This file contains a load and soak test harness for the Daycare Database Application. It simulates several front-desk
+operators working on the same data directory at once, each one driving the attendance, payment and child management
+logic of the application without opening any windows. Operators run as threads, optionally spread across several
+processes. When the run is over the harness reports latency percentiles and throughput for every operation, and checks
+the data directory for exceptions raised by the application, corrupt records, lost updates, over capacity days,
+unbilled attendance in finalized months and balances which do not match the charges and payments.
+
+Example:
+    python load_test.py --processes 2 --threads 4 --operations 200 --rate 5
+"""
+
+OPERATIONS = ['attendance_add', 'attendance_remove', 'apply_payment', 'add_child', 'remove_child', 'end_month']
+DEFAULT_MIX = 'attendance_add=40,attendance_remove=20,apply_payment=20,add_child=10,remove_child=8,end_month=2'
+DAILY_CAPACITY = 6  # Matches the limit enforced by AttendanceWindow.add_child_to_attendance
+DAILY_RATE = 40  # Matches the daily charge applied by CalendarView.end_month
+SEEDED_CHILDREN_PER_DAY = 3  # Attendance seeded on every weekday of the months end_month finalizes
+FINALIZED_MONTH_SHARE = 0.1  # Share of attendance operations aimed at the months end_month finalizes
+
+# Short rejection reasons reported for the error messages of the application, the first matching text wins
+REJECTION_REASONS = [
+    ('already been finalized', 'already finalized'),
+    ('has been finalized', 'finalized'),
+    ('Daily capacity', 'capacity'),
+    ('past dates', 'past date'),
+    ('weekends', 'weekend'),
+    ('does not exist', 'missing child'),
+    ('already attending', 'already attending'),
+    ('is not attending', 'not attending'),
+    ('already in use', 'duplicate name'),
+]
+
+
+class HeadlessMessagebox:
+    """
+    The HeadlessMessagebox class stands in for tkinter.messagebox. Instead of showing dialogs it records the messages
+    of the current thread so the harness can tell how an operation turned out.
+    """
+    def __init__(self):
+        """
+        Initialize the HeadlessMessagebox with an empty message list for every thread.
+        """
+        self.local = threading.local()
+
+    def reset(self):
+        """
+        Clear the messages recorded by the current thread.
+        """
+        self.local.messages = []
+
+    def get_messages(self):
+        """
+        Get the messages recorded by the current thread as (title, message) pairs.
+        """
+        return getattr(self.local, 'messages', [])
+
+    def showinfo(self, title, message, **kwargs):
+        """
+        Record an information message.
+        """
+        self.get_messages().append((title, message))
+
+    def showerror(self, title, message, **kwargs):
+        """
+        Record an error message.
+        """
+        self.get_messages().append((title, message))
+
+    def askyesno(self, title, message, **kwargs):
+        """
+        Record a confirmation question and always answer yes.
+        """
+        self.get_messages().append((title, message))
+        return True
+
+
+class HeadlessWindow:
+    """
+    The HeadlessWindow class stands in for the Toplevel windows the application closes after an operation.
+    """
+    def destroy(self):
+        """
+        Do nothing, there is no window to close.
+        """
+
+
+class HeadlessAttendanceWindow(AttendanceWindow):
+    """
+    The HeadlessAttendanceWindow class runs the AttendanceWindow logic for a date without creating any widgets.
+    """
+    def __init__(self, db_manager, date):
+        """
+        Initialize the HeadlessAttendanceWindow with a DatabaseManager and a date.
+        """
+        self.db_manager = db_manager
+        self.date = date
+
+    def update_labels(self):
+        """
+        Do nothing, there are no labels to update.
+        """
+
+
+class HeadlessCalendar:
+    """
+    The HeadlessCalendar class stands in for the tkcalendar Calendar with a fixed selected date.
+    """
+    def __init__(self, date):
+        """
+        Initialize the HeadlessCalendar with the selected date.
+        """
+        self.date = date
+
+    def selection_get(self):
+        """
+        Get the selected date.
+        """
+        return self.date
+
+
+class HeadlessCalendarView(CalendarView):
+    """
+    The HeadlessCalendarView class runs the CalendarView logic for a date without creating any widgets.
+    """
+    def __init__(self, db_manager, date):
+        """
+        Initialize the HeadlessCalendarView with a DatabaseManager and the selected date.
+        """
+        self.db_manager = db_manager
+        self.cal = HeadlessCalendar(date)
+
+
+class HeadlessDaycareDatabaseApp(DaycareDatabaseApp):
+    """
+    The HeadlessDaycareDatabaseApp class runs the DaycareDatabaseApp logic without creating the main window.
+    """
+    def __init__(self, db_manager):
+        """
+        Initialize the HeadlessDaycareDatabaseApp with a DatabaseManager.
+        """
+        self.db_manager = db_manager
+
+
+def install_headless_messagebox():
+    """
+    Replace the messagebox used by the application modules with a HeadlessMessagebox and return it.
+    """
+    headless_messagebox = HeadlessMessagebox()
+    for module in (attendance_window, calendar_view, daycare_database_app):
+        module.messagebox = headless_messagebox
+    return headless_messagebox
+
+
+def parse_mix(mix):
+    """
+    Parse an operation mix such as 'attendance_add=3,apply_payment=1' into a dictionary of weights.
+    """
+    weights = {}
+    for item in mix.split(','):
+        if not item.strip():
+            continue
+        operation, _, weight = item.partition('=')
+        operation = operation.strip()
+        if operation not in OPERATIONS:
+            raise ValueError(f"Unknown operation '{operation}'. Choose from: {', '.join(OPERATIONS)}.")
+        try:
+            weights[operation] = float(weight)
+        except ValueError:
+            raise ValueError(f"Invalid weight for '{operation}': '{weight}'.")
+        if weights[operation] < 0:
+            raise ValueError(f"Weight for '{operation}' cannot be negative.")
+    if not any(weights.values()):
+        raise ValueError("The operation mix must contain at least one positive weight.")
+    return weights
+
+
+def encode_letters(number):
+    """
+    Encode a non-negative integer with lowercase letters, since child names may only contain alphabetic characters.
+    """
+    letters = ''
+    while True:
+        number, remainder = divmod(number, 26)
+        letters = chr(ord('a') + remainder) + letters
+        if number == 0:
+            return letters
+
+
+def get_billing_names(count):
+    """
+    Get the names of the children who stay in the database for the whole run and are billed and paid for.
+    """
+    return [f'Billing{encode_letters(i)}' for i in range(count)]
+
+
+def get_next_month(month):
+    """
+    Get the first day of the month following the given first day of a month.
+    """
+    return (month + datetime.timedelta(days=31)).replace(day=1)
+
+
+class LoadTestConfig:
+    """
+    The LoadTestConfig class holds the settings of a load test run. It is passed to every operator process.
+    """
+    def __init__(self, data_directory, mix, operations=100, duration=None, rate=0.0, billing_children=12,
+                 days=45, seed=0):
+        """
+        Initialize the LoadTestConfig. A duration in seconds turns the run into a soak test and takes precedence over
+        the number of operations. A rate of 0 lets every operator run as fast as it can.
+        """
+        self.data_directory = data_directory
+        self.mix = mix
+        self.operations = operations
+        self.duration = duration
+        self.rate = rate
+        self.billing_children = billing_children
+        self.days = days
+        self.seed = seed
+
+        # Fixed once so every operator, thread or process, and the final checks agree on the same dates
+        self.start_date = datetime.date.today()
+
+    def get_db_manager(self):
+        """
+        Get a new DatabaseManager for the shared data directory.
+        """
+        return DatabaseManager(os.path.join(self.data_directory, 'daycare_database.csv'),
+                               os.path.join(self.data_directory, 'attendance.csv'))
+
+    def get_first_day_offset(self):
+        """
+        Get the number of days from the start date to the first date attendance is changed for. A run which lasts past
+        midnight would otherwise reach dates the application rejects as past dates, so one day is added for every day
+        the run is expected to last. Only runs bounded by a duration or a rate have an expected length, a run of a
+        number of operations without a rate is assumed to end before midnight.
+        """
+        if self.duration is not None:
+            expected_seconds = self.duration
+        elif self.rate > 0:
+            expected_seconds = self.operations / self.rate
+        else:
+            # The length of an unthrottled run is unknown
+            expected_seconds = 0
+        return math.ceil(expected_seconds / 86400) + 1
+
+    def get_attendance_dates(self):
+        """
+        Get the weekdays over the configured number of days from the first day offset onward, the dates attendance is
+        mostly changed for. These months are never finalized.
+        """
+        first_date = self.start_date + datetime.timedelta(days=self.get_first_day_offset())
+        dates = [first_date + datetime.timedelta(days=i) for i in range(self.days)]
+        return [date for date in dates if date.weekday() < 5]
+
+    def get_billing_months(self):
+        """
+        Get the first days of the months end_month finalizes, which follow the attendance dates. CalendarView.end_month
+        selects attendance by month name only, so the months stop before a month name of the attendance dates repeats.
+        """
+        dates = self.get_attendance_dates()
+        attendance_months = {date.month for date in dates}
+        months = []
+        month = get_next_month(dates[-1].replace(day=1))
+        while month.month not in attendance_months and len(months) < 12:
+            months.append(month)
+            month = get_next_month(month)
+        return months
+
+    def get_billing_month_dates(self):
+        """
+        Get the weekdays of the months end_month finalizes.
+        """
+        dates = []
+        for month in self.get_billing_months():
+            date = month
+            while date.month == month.month:
+                if date.weekday() < 5:
+                    dates.append(date)
+                date += datetime.timedelta(days=1)
+        return dates
+
+    def get_seeded_attendance(self):
+        """
+        Get the attendance the data directory starts with, a few billing children on every weekday of the months
+        end_month finalizes, so that finalizing a month has something to charge.
+        """
+        rng = random.Random(self.seed)
+        billing_names = get_billing_names(self.billing_children)
+        attendance = []
+        for date in self.get_billing_month_dates():
+            for name in rng.sample(billing_names, min(SEEDED_CHILDREN_PER_DAY, len(billing_names))):
+                attendance.append({'date': str(date), 'name': name})
+        return attendance
+
+
+class Operator:
+    """
+    The Operator class simulates one front-desk station. It performs a random sequence of operations and keeps a
+    ledger of the changes the application reported as successful.
+    """
+    def __init__(self, config, operator_id, headless_messagebox):
+        """
+        Initialize the Operator with the run configuration, its id and the messagebox used to read outcomes.
+        """
+        self.config = config
+        self.operator_id = operator_id
+        self.messagebox = headless_messagebox
+        self.random = random.Random(config.seed * 100003 + operator_id)
+        self.db_manager = config.get_db_manager()
+        self.app = HeadlessDaycareDatabaseApp(self.db_manager)
+        self.billing_names = get_billing_names(config.billing_children)
+        self.dates = config.get_attendance_dates()
+        self.billing_months = config.get_billing_months()
+        self.billing_month_dates = config.get_billing_month_dates()
+        self.operations = list(config.mix)
+        self.weights = [config.mix[operation] for operation in self.operations]
+
+        # Samples are (operation, outcome, latency in seconds)
+        self.samples = []
+        self.attendance_changes = {}
+        self.payments = {}
+        self.added_children = []
+        self.removed_children = []
+        self.missing_children = []
+        self.finalized_months = []
+        self.child_counter = 0
+
+    def run(self):
+        """
+        Perform operations until the configured number of operations or duration is reached, at the configured rate.
+        """
+        start = time.perf_counter()
+        interval = 1.0 / self.config.rate if self.config.rate > 0 else 0.0
+        count = 0
+        while True:
+            elapsed = time.perf_counter() - start
+            if self.config.duration is not None:
+                if elapsed >= self.config.duration:
+                    break
+            elif count >= self.config.operations:
+                break
+
+            # Wait for the next scheduled operation so the operator keeps a steady rate
+            if interval:
+                delay = start + count * interval - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+
+            operation = self.random.choices(self.operations, weights=self.weights)[0]
+            self.messagebox.reset()
+            operation_start = time.perf_counter()
+            try:
+                outcome = getattr(self, operation)()
+            except Exception as error:
+                outcome = f'exception: {type(error).__name__}'
+            self.samples.append((operation, outcome, time.perf_counter() - operation_start))
+            count += 1
+
+        return self.get_result()
+
+    def get_rejection(self):
+        """
+        Get the outcome of the last operation if the application refused it, such as 'rejected: capacity', or None if
+        no error message was recorded.
+        """
+        for title, message in self.messagebox.get_messages():
+            if title == 'Error':
+                for text, reason in REJECTION_REASONS:
+                    if text in message:
+                        return f'rejected: {reason}'
+                return f'rejected: {message}'
+        return None
+
+    def choose_attendance_date(self):
+        """
+        Choose a random date to change the attendance for. A small share of the dates fall in the months end_month
+        finalizes, so that changes racing with the finalization are exercised too.
+        """
+        if self.billing_month_dates and self.random.random() < FINALIZED_MONTH_SHARE:
+            return self.random.choice(self.billing_month_dates)
+        return self.random.choice(self.dates)
+
+    def attendance_add(self):
+        """
+        Add a billing child to the attendance for a random date.
+        """
+        date = self.choose_attendance_date()
+        name = self.random.choice(self.billing_names)
+        HeadlessAttendanceWindow(self.db_manager, date).add_child_to_attendance(name)
+        rejection = self.get_rejection()
+        if rejection:
+            return rejection
+        key = (str(date), name)
+        self.attendance_changes[key] = self.attendance_changes.get(key, 0) + 1
+        return 'ok'
+
+    def attendance_remove(self):
+        """
+        Remove a billing child from the attendance for a random date.
+        """
+        date = self.choose_attendance_date()
+        name = self.random.choice(self.billing_names)
+        HeadlessAttendanceWindow(self.db_manager, date).remove_child_from_attendance(name)
+        rejection = self.get_rejection()
+        if rejection:
+            return rejection
+        key = (str(date), name)
+        self.attendance_changes[key] = self.attendance_changes.get(key, 0) - 1
+        return 'ok'
+
+    def apply_payment(self):
+        """
+        Apply a random payment to a billing child and record the amount which was taken off the balance.
+        """
+        name = self.random.choice(self.billing_names)
+        amount = self.random.randrange(1000, 20001) / 100
+        self.app.apply_payment(name, f'{amount:.2f}', HeadlessWindow())
+
+        applied = None
+        for title, message in self.messagebox.get_messages():
+            if title == 'Overpayment':
+                change = float(re.search(r'Change of (\d+\.\d+)', message).group(1))
+                applied = amount - change
+            elif title == 'Success' and applied is None:
+                applied = amount
+        if applied is None:
+            # apply_payment does nothing and shows no message when the child is not in the database
+            return self.get_rejection() or 'rejected: missing child'
+        self.payments[name] = self.payments.get(name, 0.0) + applied
+        return 'ok'
+
+    def add_child(self):
+        """
+        Add a new child with a name which no other operator uses.
+        """
+        name = f'Temp{encode_letters(self.operator_id)}x{encode_letters(self.child_counter)}'.capitalize()
+        self.child_counter += 1
+        self.app.add_child(name, str(self.random.randint(1, 6)), HeadlessWindow())
+        rejection = self.get_rejection()
+        if rejection:
+            return rejection
+        self.added_children.append(name)
+        return 'ok'
+
+    def remove_child(self):
+        """
+        Remove a child this operator added earlier. DaycareDatabaseApp.remove_child always reports success, even when
+        the child is no longer in the database, so the harness looks the child up first. A child which is already gone
+        is reported as 'rejected: missing child', is not chosen again and stays unremoved in the ledger, so the missing
+        addition shows up as a lost update. The lookup and the removal are not atomic, so a child lost between the two is still counted as
+        removed, and the check on added and removed children can only catch part of the lost updates.
+        """
+        remaining = [name for name in self.added_children
+                     if name not in self.removed_children and name not in self.missing_children]
+        if not remaining:
+            return 'skipped'
+        name = self.random.choice(remaining)
+        if name not in [child['name'] for child in self.db_manager.read_database()]:
+            self.missing_children.append(name)
+            return 'rejected: missing child'
+        self.app.remove_child(name, HeadlessWindow())
+        rejection = self.get_rejection()
+        if rejection:
+            return rejection
+        self.removed_children.append(name)
+        return 'ok'
+
+    def end_month(self):
+        """
+        Finalize a random month among the months following the attendance dates.
+        """
+        if not self.billing_months:
+            return 'skipped'
+        month = self.random.choice(self.billing_months)
+        HeadlessCalendarView(self.db_manager, month).end_month()
+        rejection = self.get_rejection()
+        if rejection:
+            return rejection
+        self.finalized_months.append(month.strftime('%B_%Y'))
+        return 'ok'
+
+    def get_result(self):
+        """
+        Get the samples and ledger of the operator as plain data so it can be returned from another process.
+        """
+        return {
+            'samples': self.samples,
+            'attendance_changes': self.attendance_changes,
+            'payments': self.payments,
+            'added_children': self.added_children,
+            'removed_children': self.removed_children,
+            'finalized_months': self.finalized_months,
+        }
+
+
+def run_operators(config, operator_ids):
+    """
+    Run one operator thread for each id and return their results. This is also the entry point of operator processes.
+    """
+    headless_messagebox = install_headless_messagebox()
+    results = [None] * len(operator_ids)
+
+    def run_operator(index, operator_id):
+        results[index] = Operator(config, operator_id, headless_messagebox).run()
+
+    threads = [threading.Thread(target=run_operator, args=(index, operator_id))
+               for index, operator_id in enumerate(operator_ids)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def prepare_data_directory(config):
+    """
+    Create the shared data directory with the billing children, all with a balance of 0, and the seeded attendance.
+    """
+    os.makedirs(config.data_directory, exist_ok=True)
+    if os.listdir(config.data_directory):
+        raise ValueError(f"The data directory '{config.data_directory}' must be empty.")
+    db_manager = config.get_db_manager()
+    db_manager.write_database([{'name': name, 'age': 4, 'balance': '0'}
+                               for name in get_billing_names(config.billing_children)])
+    db_manager.write_attendance(config.get_seeded_attendance())
+
+
+def run_load_test(config, processes=1, threads=4):
+    """
+    Prepare the data directory and run processes * threads operators against it. Return the results of every
+    operator and the wall clock time of the run.
+    """
+    prepare_data_directory(config)
+    operator_ids = list(range(processes * threads))
+    start = time.perf_counter()
+    if processes == 1:
+        results = run_operators(config, operator_ids)
+    else:
+        with ProcessPoolExecutor(max_workers=processes) as executor:
+            futures = [executor.submit(run_operators, config, operator_ids[i * threads:(i + 1) * threads])
+                       for i in range(processes)]
+            results = [result for future in futures for result in future.result()]
+    return results, time.perf_counter() - start
+
+
+def percentile(values, percent):
+    """
+    Get the nearest-rank percentile of a sorted list of values.
+    """
+    if not values:
+        return 0.0
+    rank = max(1, -(-len(values) * percent // 100))
+    return values[int(rank) - 1]
+
+
+def summarize_samples(results, elapsed):
+    """
+    Get the count, throughput and latency percentiles in milliseconds of every (operation, outcome) pair. Outcomes
+    are kept apart because a rejected operation returns before it writes anything. The successful operations of all
+    kinds are summarized under ('total', 'ok') and every operation under ('total', 'all').
+    """
+    latencies_by_key = {}
+    for result in results:
+        for operation, outcome, latency in result['samples']:
+            latencies_by_key.setdefault((operation, outcome), []).append(latency)
+            latencies_by_key.setdefault(('total', 'all'), []).append(latency)
+            if outcome == 'ok':
+                latencies_by_key.setdefault(('total', 'ok'), []).append(latency)
+
+    summary = {}
+    for key, latencies in latencies_by_key.items():
+        latencies = sorted(latency * 1000 for latency in latencies)
+        summary[key] = {
+            'count': len(latencies),
+            'throughput': len(latencies) / elapsed if elapsed else 0.0,
+            'p50': percentile(latencies, 50),
+            'p90': percentile(latencies, 90),
+            'p99': percentile(latencies, 99),
+            'max': latencies[-1],
+        }
+    return summary
+
+
+def describe_row(row):
+    """
+    Get a short printable description of a CSV row, which may be corrupt.
+    """
+    description = repr(dict(row))
+    return description if len(description) <= 80 else description[:77] + '...'
+
+
+def read_rows(read, source, violations):
+    """
+    Read the rows of a CSV file with the given function. A file which cannot be parsed at all is recorded as a
+    violation and read as empty.
+    """
+    try:
+        return read()
+    except (csv.Error, UnicodeDecodeError) as error:
+        violations.append(f"Corrupt {source}: {error}.")
+        return []
+
+
+def parse_attendance_rows(rows, source, violations):
+    """
+    Get the (date, name) pairs of attendance rows. Rows with a missing or invalid date or a missing name, as left by
+    concurrent writes, are recorded as violations and skipped.
+    """
+    records = []
+    for row in rows:
+        date = row.get('date')
+        name = row.get('name')
+        try:
+            datetime.date.fromisoformat(date)
+        except (TypeError, ValueError):
+            date = None
+        if date is None or not name:
+            violations.append(f"Corrupt {source} record: {describe_row(row)}.")
+            continue
+        records.append((date, name))
+    return records
+
+
+def parse_children_rows(rows, violations):
+    """
+    Get the (name, balance) pairs of database rows. Rows without a name are recorded as violations and skipped, rows
+    with an invalid balance are recorded as violations and kept with a balance of None.
+    """
+    children = []
+    for row in rows:
+        name = row.get('name')
+        if not name:
+            violations.append(f"Corrupt database record: {describe_row(row)}.")
+            continue
+        try:
+            balance = float(row.get('balance'))
+        except (TypeError, ValueError):
+            violations.append(f"Corrupt database record: {describe_row(row)}.")
+            balance = None
+        children.append((name, balance))
+    return children
+
+
+def read_end_month_rows(filename):
+    """
+    Read the rows of an EndMonth file.
+    """
+    with open(filename, mode='r', newline='') as file:
+        return list(csv.DictReader(file))
+
+
+def check_invariants(config, results):
+    """
+    Compare the final state of the data directory with the ledgers of the operators and return a list of violations.
+    """
+    violations = []
+    db_manager = config.get_db_manager()
+    children = parse_children_rows(read_rows(db_manager.read_database, 'database', violations), violations)
+    attendance = parse_attendance_rows(read_rows(db_manager.read_attendance, 'attendance', violations),
+                                      'attendance', violations)
+    billing_names = get_billing_names(config.billing_children)
+
+    # No operation may raise an exception from the application
+    exception_counts = {}
+    for result in results:
+        for operation, outcome, _ in result['samples']:
+            if outcome.startswith('exception: '):
+                key = (operation, outcome[len('exception: '):])
+                exception_counts[key] = exception_counts.get(key, 0) + 1
+    for (operation, exception), count in sorted(exception_counts.items()):
+        violations.append(f"{operation} raised {exception} {count} time(s).")
+
+    # No day may have more children than the daily capacity, and no child may be recorded twice on the same day
+    daily_counts = {}
+    record_counts = {}
+    for key in attendance:
+        daily_counts[key[0]] = daily_counts.get(key[0], 0) + 1
+        record_counts[key] = record_counts.get(key, 0) + 1
+    for date, count in sorted(daily_counts.items()):
+        if count > DAILY_CAPACITY:
+            violations.append(f"{date} has {count} children, more than the capacity of {DAILY_CAPACITY}.")
+    for (date, name), count in sorted(record_counts.items()):
+        if count > 1:
+            violations.append(f"{name} is recorded {count} times on {date}.")
+
+    # Every successful attendance change must still be reflected in the attendance data
+    attendance_changes = {}
+    for record in config.get_seeded_attendance():
+        key = (record['date'], record['name'])
+        attendance_changes[key] = attendance_changes.get(key, 0) + 1
+    for result in results:
+        for key, change in result['attendance_changes'].items():
+            attendance_changes[key] = attendance_changes.get(key, 0) + change
+    for key in sorted(set(attendance_changes) | set(record_counts)):
+        expected = attendance_changes.get(key, 0)
+        actual = record_counts.get(key, 0)
+        if expected != actual:
+            violations.append(f"Lost attendance update for {key[1]} on {key[0]}: "
+                              f"expected {expected} record(s), found {actual}.")
+
+    # Billing children are never removed, and added children are present exactly until they are removed
+    child_counts = {}
+    for name, _ in children:
+        child_counts[name] = child_counts.get(name, 0) + 1
+    for name, count in sorted(child_counts.items()):
+        if count > 1:
+            violations.append(f"{name} is recorded {count} times in the database.")
+    for name in billing_names:
+        if name not in child_counts:
+            violations.append(f"Lost update: billing child {name} is missing from the database.")
+    for result in results:
+        for name in result['added_children']:
+            if name in result['removed_children'] and name in child_counts:
+                violations.append(f"Lost update: {name} was removed but is still in the database.")
+            elif name not in result['removed_children'] and name not in child_counts:
+                violations.append(f"Lost update: {name} was added but is missing from the database.")
+
+    # Every month may only be finalized once
+    finalized_counts = {}
+    for result in results:
+        for month in result['finalized_months']:
+            finalized_counts[month] = finalized_counts.get(month, 0) + 1
+    for month, count in sorted(finalized_counts.items()):
+        if count > 1:
+            violations.append(f"{month.replace('_', ' ')} was finalized {count} times.")
+
+    # Every attendance record in a finalized month must have been billed in the EndMonth file of that month, and
+    # every billed record must still be in the attendance data
+    billed_counts = {}
+    for filename in glob.glob(os.path.join(config.data_directory, '*_EndMonth.csv')):
+        month = os.path.basename(filename)[:-len('_EndMonth.csv')]
+        month_billed_counts = billed_counts[month] = {}
+        source = os.path.basename(filename)
+        rows = read_rows(lambda: read_end_month_rows(filename), source, violations)
+        for key in parse_attendance_rows(rows, source, violations):
+            month_billed_counts[key] = month_billed_counts.get(key, 0) + 1
+    for month, month_billed_counts in sorted(billed_counts.items()):
+        month_record_counts = {key: count for key, count in record_counts.items()
+                               if datetime.date.fromisoformat(key[0]).strftime('%B_%Y') == month}
+        for key in sorted(set(month_record_counts) | set(month_billed_counts)):
+            attended = month_record_counts.get(key, 0)
+            billed = month_billed_counts.get(key, 0)
+            if attended > billed:
+                violations.append(f"{key[1]} is in the attendance for {key[0]} but was not billed when "
+                                  f"{month.replace('_', ' ')} was finalized.")
+            elif billed > attended:
+                violations.append(f"{key[1]} was billed for {key[0]} when {month.replace('_', ' ')} was finalized "
+                                  f"but is no longer in the attendance.")
+
+    # Balances must equal the charges of the finalized months minus the payments applied
+    charges = {name: 0.0 for name in billing_names}
+    for month_billed_counts in billed_counts.values():
+        for (date, name), count in month_billed_counts.items():
+            if name in charges:
+                charges[name] += DAILY_RATE * count
+    payments = {name: 0.0 for name in billing_names}
+    for result in results:
+        for name, amount in result['payments'].items():
+            payments[name] += amount
+    for name, balance in children:
+        if name in charges and balance is not None:
+            expected = charges[name] - payments[name]
+            if abs(balance - expected) > 0.005:
+                violations.append(f"{name} has a balance of {balance:.2f}, expected {expected:.2f} "
+                                  f"(charges {charges[name]:.2f} minus payments {payments[name]:.2f}).")
+    return violations
+
+
+def print_report(summary, elapsed, violations):
+    """
+    Print the latency and throughput of every operation and outcome, followed by the invariant violations.
+    """
+    print(f"Run time: {elapsed:.2f} s")
+    print(f"{'Operation':<18} {'Outcome':<30} {'Count':>7} {'Ops/s':>9} {'p50 ms':>9} {'p90 ms':>9} {'p99 ms':>9} "
+          f"{'Max ms':>9}")
+    for operation in OPERATIONS + ['total']:
+        # Successful operations first, then the other outcomes in alphabetical order
+        outcomes = sorted((outcome for key_operation, outcome in summary if key_operation == operation),
+                          key=lambda outcome: (outcome != 'ok', outcome))
+        for outcome in outcomes:
+            stats = summary[(operation, outcome)]
+            print(f"{operation:<18} {outcome:<30} {stats['count']:>7} {stats['throughput']:>9.1f} "
+                  f"{stats['p50']:>9.2f} {stats['p90']:>9.2f} {stats['p99']:>9.2f} {stats['max']:>9.2f}")
+
+    if violations:
+        print(f"\n{len(violations)} invariant violation(s):")
+        for violation in violations:
+            print(f"  - {violation}")
+    else:
+        print("\nAll invariants hold.")
+
+
+def main():
+    """
+    Parse the command line, run the load test and print the report. Return 1 if an invariant was violated.
+    """
+    parser = argparse.ArgumentParser(description='Run simulated front-desk operators against a shared data '
+                                                 'directory and check the results.')
+    parser.add_argument('--processes', type=int, default=1, help='number of operator processes (default 1)')
+    parser.add_argument('--threads', type=int, default=4, help='number of operator threads per process (default 4)')
+    parser.add_argument('--operations', type=int, default=100, help='operations per operator (default 100)')
+    parser.add_argument('--duration', type=float, help='run for this many seconds instead of a number of operations')
+    parser.add_argument('--rate', type=float, default=0.0,
+                        help='operations per second per operator, 0 for as fast as possible (default 0)')
+    parser.add_argument('--mix', default=DEFAULT_MIX, help=f'operation weights (default {DEFAULT_MIX})')
+    parser.add_argument('--children', type=int, default=12, help='number of billing children (default 12)')
+    parser.add_argument('--days', type=int, default=45,
+                        help='attendance is changed for weekdays within this many days, starting tomorrow or one day later '
+                             'for every day a --duration or --rate run is expected to last; an --operations run '
+                             'without a --rate must end before midnight (default 45)')
+    parser.add_argument('--data-dir', help='empty directory for the shared data (default a new temporary directory)')
+    parser.add_argument('--seed', type=int, default=0, help='random seed (default 0)')
+    args = parser.parse_args()
+
+    if args.processes < 1 or args.threads < 1:
+        parser.error('--processes and --threads must be at least 1.')
+    if args.children < 1:
+        parser.error('--children must be at least 1.')
+    try:
+        mix = parse_mix(args.mix)
+    except ValueError as error:
+        parser.error(str(error))
+
+    data_directory = args.data_dir or tempfile.mkdtemp(prefix='daycare_load_test_')
+    config = LoadTestConfig(data_directory, mix, operations=args.operations, duration=args.duration,
+                            rate=args.rate, billing_children=args.children, days=args.days, seed=args.seed)
+    if not config.get_attendance_dates():
+        parser.error('--days must include at least one weekday.')
+    try:
+        results, elapsed = run_load_test(config, processes=args.processes, threads=args.threads)
+    except ValueError as error:
+        parser.error(str(error))
+
+    print(f"Data directory: {data_directory}")
+    violations = check_invariants(config, results)
+    print_report(summarize_samples(results, elapsed), elapsed, violations)
+    return 1 if violations else 0
+
+
+if __name__ == "__main__":
+    """
+    This condition checks if this file is the entry point of the program. If it is, it runs the load test from the
+    command line arguments.
+    """
+    raise SystemExit(main())